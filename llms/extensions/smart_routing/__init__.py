@@ -7,11 +7,11 @@ prompt complexity and configured preferences.
 
 from __future__ import annotations
 
+import asyncio
 import json
-import math
 import os
 import re
-from copy import deepcopy
+from collections import Counter
 from typing import Any, Dict, List, Optional, Tuple
 
 from aiohttp import web
@@ -26,24 +26,24 @@ from .config import (
     default_config,
 )
 from .router import rank_candidates
-from .scorer import classify
+from .scorer import KEYWORD_LISTS, classify
 
 g_ctx = None
 g_config = None
-g_stats = {
-    "total_routed": 0,
-    "tiers": {"SIMPLE": 0, "MEDIUM": 0, "COMPLEX": 0, "REASONING": 0},
-    "providers": {},
-    "ambiguous": 0,
-    "fallback_attempts": 0,
-    "candidate_failures": 0,
-}
+# Routing statistics. Updated and read only on the event loop; not safe to touch from other threads.
+g_counters = Counter({"total_routed": 0, "ambiguous": 0, "fallback_attempts": 0, "candidate_failures": 0})
+g_tier_counts = Counter(dict.fromkeys(TIERS, 0))
+g_provider_counts = Counter()
 
 _SELECTION_CONTEXT_KEY = "_smart_routing_selection"
+_STRUCTURED_RE = re.compile(r"json|structured|schema", re.IGNORECASE)
+
+
+_CONFIG_PATH = os.path.expanduser("~/.llms/smart_routing.json")
 
 
 def _config_path():
-    return os.path.expanduser("~/.llms/smart_routing.json")
+    return _CONFIG_PATH
 
 
 def _log(message):
@@ -51,19 +51,33 @@ def _log(message):
         g_ctx.log(message)
 
 
+def _clone_config(value):
+    if isinstance(value, dict):
+        return {key: _clone_config(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_clone_config(item) if isinstance(item, (dict, list)) else item for item in value]
+    return value
+
+
+def _deep_merge_into(dst, src):
+    stack = [(dst, src)]
+    while stack:
+        target, source = stack.pop()
+        for key, value in source.items():
+            target_value = target.get(key)
+            if isinstance(target_value, dict) and isinstance(value, dict):
+                stack.append((target_value, value))
+            else:
+                target[key] = _clone_config(value)
+    return dst
+
+
 def _deep_merge(base, override):
     if not isinstance(base, dict):
-        return deepcopy(override)
-    merged = deepcopy(base)
-    if not isinstance(override, dict):
-        return merged
-
-    for key, value in override.items():
-        base_value = merged.get(key)
-        if isinstance(base_value, dict) and isinstance(value, dict):
-            merged[key] = _deep_merge(base_value, value)
-        else:
-            merged[key] = deepcopy(value)
+        return _clone_config(override)
+    merged = _clone_config(base)
+    if isinstance(override, dict):
+        _deep_merge_into(merged, override)
     return merged
 
 
@@ -80,6 +94,8 @@ def _coerce_bool(value, default):
 
 
 def _coerce_int(value, default, minimum=0):
+    if type(value) is int:
+        return value if value >= minimum else default
     try:
         coerced = int(value)
     except (TypeError, ValueError):
@@ -88,10 +104,13 @@ def _coerce_int(value, default, minimum=0):
 
 
 def _coerce_float(value, default, minimum=None, maximum=None):
-    try:
-        coerced = float(value)
-    except (TypeError, ValueError):
-        return default
+    if type(value) is float:
+        coerced = value
+    else:
+        try:
+            coerced = float(value)
+        except (TypeError, ValueError):
+            return default
     if minimum is not None and coerced < minimum:
         return default
     if maximum is not None and coerced > maximum:
@@ -102,12 +121,14 @@ def _coerce_float(value, default, minimum=None, maximum=None):
 def _coerce_tier(value, default):
     if value is None:
         return default
+    if isinstance(value, str) and value in TIER_RANK:
+        return value
     tier = str(value).upper()
     return tier if tier in TIER_RANK else default
 
 
 def _sanitize_string_list(value, default):
-    if not isinstance(value, list):
+    if not isinstance(value, (list, tuple)):
         return list(default)
     ret = []
     for item in value:
@@ -120,12 +141,16 @@ def _sanitize_string_list(value, default):
 
 def _sanitize_capabilities(value, default):
     if not isinstance(value, dict):
-        return deepcopy(default)
+        return dict(default)
     return {str(k): bool(v) for k, v in value.items()}
 
 
 def _normalize_scoring(scoring):
-    merged = _deep_merge(DEFAULT_SCORING_CONFIG, scoring if isinstance(scoring, dict) else {})
+    # a shallow copy is enough: every nested section is rebuilt below, and the subtrees
+    # shared from DEFAULT_SCORING_CONFIG are read-only
+    merged = dict(DEFAULT_SCORING_CONFIG)
+    if isinstance(scoring, dict):
+        merged.update((key, _clone_config(value)) for key, value in scoring.items())
 
     merged["tokenCountThresholds"] = {
         "simple": _coerce_int(
@@ -142,22 +167,9 @@ def _normalize_scoring(scoring):
     if merged["tokenCountThresholds"]["complex"] < merged["tokenCountThresholds"]["simple"]:
         merged["tokenCountThresholds"]["complex"] = merged["tokenCountThresholds"]["simple"]
 
-    keyword_lists = [
-        "codeKeywords",
-        "reasoningKeywords",
-        "simpleKeywords",
-        "technicalKeywords",
-        "creativeKeywords",
-        "imperativeVerbs",
-        "constraintIndicators",
-        "outputFormatKeywords",
-        "referenceKeywords",
-        "negationKeywords",
-        "domainSpecificKeywords",
-        "agenticTaskKeywords",
-    ]
-    for key in keyword_lists:
-        merged[key] = _sanitize_string_list(merged.get(key), DEFAULT_SCORING_CONFIG[key])
+    # keywords are matched as substrings of the lowercased prompt, so store them lowercased
+    for key in KEYWORD_LISTS:
+        merged[key] = tuple(kw.lower() for kw in _sanitize_string_list(merged.get(key), DEFAULT_SCORING_CONFIG[key]))
 
     default_weights = DEFAULT_SCORING_CONFIG["dimensionWeights"]
     weights = merged.get("dimensionWeights", {})
@@ -234,24 +246,45 @@ def _normalize_overrides(overrides):
             DEFAULT_OVERRIDES["ambiguousDefaultTier"],
         ),
         "agenticMode": _coerce_bool(merged.get("agenticMode"), DEFAULT_OVERRIDES["agenticMode"]),
+        "parallelFallback": _coerce_int(merged.get("parallelFallback"), DEFAULT_OVERRIDES["parallelFallback"]),
+        "batchConcurrency": _coerce_int(
+            merged.get("batchConcurrency"),
+            DEFAULT_OVERRIDES["batchConcurrency"],
+            minimum=1,
+        ),
     }
     return normalized
 
 
-def normalize_config(raw_config):
+_SECTION_NORMALIZERS = (
+    ("scoring", _normalize_scoring),
+    ("overrides", _normalize_overrides),
+    ("tierPreferences", lambda raw: _normalize_preferences(raw, DEFAULT_TIER_PREFERENCES)),
+    ("agenticPreferences", lambda raw: _normalize_preferences(raw, DEFAULT_AGENTIC_PREFERENCES)),
+)
+
+
+def _normalize_sections(raw_config, previous_raw=None, previous_config=None):
+    """
+    Normalize each config section, reusing the previously normalized section
+    when its raw (defaults-merged) input is unchanged.
+    Returns (normalized_config, raw_sections).
+    """
     merged = _deep_merge(default_config(), raw_config if isinstance(raw_config, dict) else {})
-    return {
-        "scoring": _normalize_scoring(merged.get("scoring", {})),
-        "overrides": _normalize_overrides(merged.get("overrides", {})),
-        "tierPreferences": _normalize_preferences(
-            merged.get("tierPreferences", {}),
-            DEFAULT_TIER_PREFERENCES,
-        ),
-        "agenticPreferences": _normalize_preferences(
-            merged.get("agenticPreferences", {}),
-            DEFAULT_AGENTIC_PREFERENCES,
-        ),
-    }
+    normalized = {}
+    raw_sections = {}
+    for section, normalize in _SECTION_NORMALIZERS:
+        raw_section = merged.get(section, {})
+        raw_sections[section] = raw_section
+        if previous_raw and previous_config and section in previous_config and previous_raw.get(section) == raw_section:
+            normalized[section] = previous_config[section]
+        else:
+            normalized[section] = normalize(raw_section)
+    return normalized, raw_sections
+
+
+def normalize_config(raw_config):
+    return _normalize_sections(raw_config)[0]
 
 
 def _load_user_config():
@@ -274,15 +307,48 @@ def _save_user_config(config):
     config_path = _config_path()
     os.makedirs(os.path.dirname(config_path), exist_ok=True)
     tmp_path = "%s.tmp" % config_path
-    with open(tmp_path, "w", encoding="utf-8") as handle:
-        json.dump(config, handle, indent=2, sort_keys=True)
-        handle.write("\n")
+    payload = (json.dumps(config, indent=2, sort_keys=True) + "\n").encode("utf-8")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
     os.replace(tmp_path, config_path)
 
 
+def _flush_stats(delta, tier=None, provider_id=None):
+    if provider_id is not None:
+        g_counters.update(("total_routed",))
+        g_tier_counts.update((tier,))
+        g_provider_counts.update((provider_id,))
+    g_counters.update({key: value for key, value in delta.items() if value})
+
+
+def get_stats():
+    stats = dict(g_counters)
+    stats["tiers"] = dict(g_tier_counts)
+    stats["providers"] = dict(g_provider_counts)
+    return stats
+
+
+def _providers_version(providers):
+    # changes when a provider, its models or its map_models are replaced
+    return tuple(
+        (
+            provider_id,
+            id(provider),
+            id(getattr(provider, "models", None)),
+            id(getattr(provider, "map_models", None)),
+            len(getattr(provider, "models", None) or ()),
+        )
+        for provider_id, provider in providers.items()
+    )
+
+
 def _chat_content_to_text(content):
-    if isinstance(content, str):
-        return content
+    """Slow path for non-string message content; callers handle plain strings inline."""
     if isinstance(content, list):
         parts = []
         for part in content:
@@ -300,24 +366,34 @@ def _chat_content_to_text(content):
     return ""
 
 
-def _last_user_prompt(messages):
-    if not isinstance(messages, list):
-        return ""
-    for message in reversed(messages):
-        if isinstance(message, dict) and message.get("role") == "user":
-            return _chat_content_to_text(message.get("content"))
-    return ""
-
-
-def _system_prompt(messages):
+def _extract_prompts(messages):
+    """Single pass over messages returning (last user prompt, first system prompt or None)."""
     if not isinstance(messages, list):
-        return None
+        return "", None
+    last_user = None
+    system = None
+    seen_system = False
     for message in messages:
-        if isinstance(message, dict) and message.get("role") == "system":
+        if not isinstance(message, dict):
+            continue
+        role = message.get("role")
+        if role == "user":
+            last_user = message
+        elif role == "system" and not seen_system:
+            seen_system = True
             content = message.get("content")
-            text = _chat_content_to_text(content)
-            return text if text else None
-    return None
+            system = (content if isinstance(content, str) else _chat_content_to_text(content)) or None
+    if last_user is None:
+        return "", system
+    content = last_user.get("content")
+    prompt = content if isinstance(content, str) else _chat_content_to_text(content)
+    return prompt, system
+
+
+def _discard_task_result(task):
+    # retrieve the outcome of a cancelled race task so asyncio does not log it as unhandled
+    if not task.cancelled():
+        task.exception()
 
 
 class SmartRouterProvider:
@@ -325,7 +401,7 @@ class SmartRouterProvider:
 
     sdk = "@llmspy/smart-routing"
 
-    def __init__(self, ctx, config=None):
+    def __init__(self, ctx, config=None, previous=None):
         self.ctx = ctx
         self.id = "smart_routing"
         self.name = "Smart Routing"
@@ -347,11 +423,15 @@ class SmartRouterProvider:
             }
         }
 
-        self.config = normalize_config(config or {})
+        previous_raw = getattr(previous, "_raw_sections", None)
+        previous_config = getattr(previous, "config", None)
+        self.config, self._raw_sections = _normalize_sections(config or {}, previous_raw, previous_config)
         self.scoring_config = self.config["scoring"]
         self.overrides = self.config["overrides"]
         self.tier_preferences = self.config["tierPreferences"]
         self.agentic_preferences = self.config["agenticPreferences"]
+        self._rank_cache = {}
+        self._providers_version = None
 
     def test(self, **kwargs):
         return True
@@ -400,7 +480,7 @@ class SmartRouterProvider:
             info = models.get(resolved)
             if not isinstance(info, dict):
                 return None
-        return provider_id, resolved, info
+        return provider_id, resolved, info, provider
 
     def _pin_selection(self, context, provider_id, model_id, tier, confidence, agentic):
         if not isinstance(context, dict):
@@ -413,22 +493,20 @@ class SmartRouterProvider:
             "agentic": bool(agentic),
         }
 
-    def _update_context_provider_info(self, context, provider, provider_id, model_id):
+    def _update_context_provider_info(self, context, provider_id, model_info):
         if not isinstance(context, dict):
             return
         context["provider"] = provider_id
-        model_info = provider.model_info(model_id) or provider.model_info(provider.provider_model(model_id) or model_id)
         if isinstance(model_info, dict):
             context["modelInfo"] = model_info
             context["modelCost"] = model_info.get("cost", {"input": 0, "output": 0})
 
-    async def chat(self, chat, context=None):
+    def _route(self, chat):
+        """Classify a chat and resolve its tier: (result, tier, confidence, use_agentic, ambiguous, reasoning_parts)."""
         messages = chat.get("messages", [])
-        prompt = _last_user_prompt(messages)
-        system_prompt = _system_prompt(messages)
+        prompt, system_prompt = _extract_prompts(messages)
 
-        full_text = "%s %s" % (system_prompt or "", prompt)
-        estimated_tokens = max(1, int(math.ceil(len(full_text) / 4.0)))
+        estimated_tokens = max(1, (len(system_prompt or "") + 1 + len(prompt) + 3) // 4)
 
         has_tools = bool(chat.get("tools"))
         result = classify(prompt, system_prompt, estimated_tokens, self.scoring_config)
@@ -448,13 +526,13 @@ class SmartRouterProvider:
             confidence = 0.95
             reasoning_parts.append("large context (%d tokens)" % estimated_tokens)
 
-        if tier is None:
+        ambiguous = tier is None
+        if ambiguous:
             tier = self.overrides.get("ambiguousDefaultTier", "MEDIUM")
             confidence = 0.5
             reasoning_parts.append("ambiguous -> %s" % tier)
-            g_stats["ambiguous"] += 1
 
-        if system_prompt and re.search(r"json|structured|schema", system_prompt, re.IGNORECASE):
+        if system_prompt and _STRUCTURED_RE.search(system_prompt):
             min_tier = self.overrides.get("structuredOutputMinTier", "MEDIUM")
             if TIER_RANK.get(tier, 0) < TIER_RANK.get(min_tier, 0):
                 tier = min_tier
@@ -467,77 +545,187 @@ class SmartRouterProvider:
         elif is_explicit_agentic:
             reasoning_parts.append("forced-agentic")
 
-        providers = self.ctx.get_providers()
-        pinned_selection = self._get_pinned_selection(context, providers)
-        if pinned_selection:
-            candidates = [pinned_selection]
-            pinned = True
-        else:
-            candidates = rank_candidates(
+        return result, tier, confidence, use_agentic, ambiguous, reasoning_parts
+
+    def _rank(self, tier, use_agentic, providers):
+        version = _providers_version(providers)
+        if version != self._providers_version:
+            self._rank_cache.clear()
+            self._providers_version = version
+        key = (tier, use_agentic)
+        candidates = self._rank_cache.get(key)
+        if candidates is None:
+            candidates = self._rank_cache[key] = rank_candidates(
                 tier,
                 use_agentic,
                 providers,
                 preferences=self.tier_preferences,
                 agentic_preferences=self.agentic_preferences,
             )
+        return candidates
+
+    async def chat(self, chat, context=None):
+        route = self._route(chat)
+        _result, tier, _confidence, use_agentic, _ambiguous, _reasoning_parts = route
+        providers = self.ctx.get_providers()
+        pinned_selection = self._get_pinned_selection(context, providers)
+        if pinned_selection:
+            candidates = [pinned_selection]
+            pinned = True
+        else:
+            candidates = self._rank(tier, use_agentic, providers)
             pinned = False
+        return await self._dispatch(chat, context, candidates, pinned, route)
+
+    async def chat_batch(self, chats):
+        """
+        Route many chats in one call. Candidate rankings are shared per
+        (tier, agentic) combination and up to overrides.batchConcurrency chats
+        are dispatched at a time.
+        Returns responses in input order, with an Exception in place of failed chats.
+        """
+        providers = self.ctx.get_providers()
+        semaphore = asyncio.Semaphore(int(self.overrides.get("batchConcurrency", 8)))
+
+        async def dispatch(chat, candidates, route):
+            async with semaphore:
+                return await self._dispatch(chat, {}, candidates, False, route)
+
+        tasks = []
+        for chat in chats:
+            route = self._route(chat)
+            _result, tier, _confidence, use_agentic, _ambiguous, _reasoning_parts = route
+            candidates = self._rank(tier, use_agentic, providers)
+            tasks.append(dispatch(chat, candidates, route))
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _dispatch(self, chat, context, candidates, pinned, route):
+        result, tier, confidence, use_agentic, ambiguous, reasoning_parts = route
+        delta = {"ambiguous": 1 if ambiguous else 0, "fallback_attempts": 0, "candidate_failures": 0}
+        routed_provider_id = None
+        # candidates are tried by rewriting chat["model"]; restore the caller's value afterwards
+        original_model = chat.get("model")
+        try:
+            winner, attempts = await self._attempt_candidates(chat, context, candidates, pinned, reasoning_parts, delta)
+            routed_provider_id = winner[1]
+        finally:
+            if original_model is None:
+                chat.pop("model", None)
+            else:
+                chat["model"] = original_model
+            _flush_stats(delta, tier, routed_provider_id)
+
+        response, provider_id, model_id = winner
+        self._pin_selection(context, provider_id, model_id, tier, confidence, use_agentic)
+
+        reasoning = " | ".join(reasoning_parts)
+        self.ctx.log("Routed: tier=%s conf=%.2f -> %s/%s (%s)" % (tier, confidence, provider_id, model_id, reasoning))
+
+        if isinstance(response, dict):
+            response["routing"] = {
+                "tier": tier,
+                "confidence": round(confidence, 3),
+                "score": round(result.score, 4),
+                "provider": provider_id,
+                "model": model_id,
+                "agentic": use_agentic,
+                "signals": list(result.signals),
+                "pinned": pinned,
+                "attempts": attempts,
+                "reasoning": reasoning,
+            }
+        return response
 
+    async def _attempt_candidates(self, chat, context, candidates, pinned, reasoning_parts, delta):
+        """Try candidates until one succeeds. Returns ((response, provider_id, model_id), attempts)."""
         if not candidates:
             raise Exception("Smart routing: no available provider candidates")
 
         first_exception = None
-        for index, candidate in enumerate(candidates):
-            provider_id, model_id, _model_info = candidate
-            provider = providers.get(provider_id)
-            if not provider or provider_id == "smart_routing":
-                continue
-
-            if index > 0:
-                g_stats["fallback_attempts"] += 1
+        attempts = 0
+        parallel = int(self.overrides.get("parallelFallback", 0))
+        if not pinned and parallel > 1 and len(candidates) > 1:
+            raced = candidates[:parallel]
+            candidates = candidates[parallel:]
+            winner, failures, winner_rank = await self._race_candidates(raced, chat, context)
+            reasoning_parts.append("raced=%d" % len(raced))
+            # only candidates that finished count as attempts; a win by the top candidate is no fallback
+            attempts = len(failures) + (1 if winner is not None else 0)
+            if winner_rank != 0:
+                delta["fallback_attempts"] += attempts - 1
+            delta["candidate_failures"] += len(failures)
+            if winner is not None:
+                return winner, attempts
+            if failures:
+                first_exception = failures[0]
+
+        for candidate in candidates:
+            provider_id, model_id, model_info, provider = candidate
+            if attempts > 0:
+                delta["fallback_attempts"] += 1
                 reasoning_parts.append("fallback=%s/%s" % (provider_id, model_id))
+            attempts += 1
 
             chat["model"] = model_id
-            self._update_context_provider_info(context, provider, provider_id, model_id)
+            self._update_context_provider_info(context, provider_id, model_info)
 
             try:
                 response = await provider.chat(chat, context=context)
             except Exception as ex:
-                g_stats["candidate_failures"] += 1
+                delta["candidate_failures"] += 1
                 if first_exception is None:
                     first_exception = ex
                 self.ctx.log("Candidate failed %s/%s: %s" % (provider_id, model_id, ex))
                 continue
 
-            self._pin_selection(context, provider_id, model_id, tier, confidence, use_agentic)
-
-            g_stats["total_routed"] += 1
-            g_stats["tiers"][tier] = g_stats["tiers"].get(tier, 0) + 1
-            g_stats["providers"][provider_id] = g_stats["providers"].get(provider_id, 0) + 1
-
-            self.ctx.log(
-                "Routed: tier=%s conf=%.2f -> %s/%s (%s)"
-                % (tier, confidence, provider_id, model_id, " | ".join(reasoning_parts))
-            )
-
-            if isinstance(response, dict):
-                response["routing"] = {
-                    "tier": tier,
-                    "confidence": round(confidence, 3),
-                    "score": round(result.score, 4),
-                    "provider": provider_id,
-                    "model": model_id,
-                    "agentic": use_agentic,
-                    "signals": result.signals,
-                    "pinned": pinned,
-                    "attempts": index + 1,
-                    "reasoning": " | ".join(reasoning_parts),
-                }
-            return response
+            return (response, provider_id, model_id), attempts
 
         if first_exception:
             raise first_exception
         raise Exception("Smart routing: no candidate provider could fulfill this request")
 
+    async def _race_candidates(self, candidates, chat, context):
+        """
+        Start all candidates concurrently and keep the best-ranked first success.
+        Returns (winner, failures, rank) where winner is (response, provider_id, model_id) and rank its
+        index in candidates, or (None, failures, None) when every candidate failed.
+        """
+        tasks = {}
+        for provider_id, model_id, model_info, provider in candidates:
+            task_chat = {**chat, "model": model_id}
+            task_context = dict(context) if isinstance(context, dict) else context
+            self._update_context_provider_info(task_context, provider_id, model_info)
+            task = asyncio.ensure_future(provider.chat(task_chat, context=task_context))
+            tasks[task] = (provider_id, model_id, task_context)
+
+        failures = []
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = None
+                # tasks is in rank order, so the best-ranked of simultaneous completions wins;
+                # every finished task is still inspected so same-round failures are recorded
+                for rank, (task, (provider_id, model_id, task_context)) in enumerate(tasks.items()):
+                    if task not in done:
+                        continue
+                    ex = task.exception()
+                    if ex is not None:
+                        failures.append(ex)
+                        self.ctx.log("Candidate failed %s/%s: %s" % (provider_id, model_id, ex))
+                    elif winner is None:
+                        winner = ((task.result(), provider_id, model_id), rank, task_context)
+                if winner is not None:
+                    response, rank, task_context = winner
+                    if isinstance(context, dict):
+                        context.update(task_context)
+                    return response, failures, rank
+        finally:
+            for task in pending:
+                task.cancel()
+                task.add_done_callback(_discard_task_result)
+        return None, failures, None
+
 
 async def get_config_handler(request):
     return web.json_response(g_config or default_config())
@@ -550,18 +738,45 @@ async def update_config_handler(request):
         if not isinstance(updates, dict):
             raise ValueError("Expected JSON object")
 
-        g_config = normalize_config(_deep_merge(g_config or default_config(), updates))
+        providers = g_ctx.get_providers()
+        previous = providers.get("smart_routing")
+        if not isinstance(previous, SmartRouterProvider):
+            previous = None
+        smart = SmartRouterProvider(g_ctx, _deep_merge(g_config or default_config(), updates), previous=previous)
+        g_config = smart.config
         _save_user_config(g_config)
 
-        providers = g_ctx.get_providers()
-        providers["smart_routing"] = SmartRouterProvider(g_ctx, g_config)
+        providers["smart_routing"] = smart
         return web.json_response({"status": "ok", "config": g_config})
     except Exception as ex:
         return web.json_response({"error": str(ex)}, status=400)
 
 
+async def batch_chat_handler(request):
+    is_authenticated, _user_data = g_ctx.check_auth(request)
+    if not is_authenticated:
+        return web.json_response(g_ctx.error_auth_required, status=401)
+    try:
+        chats = await request.json()
+        if isinstance(chats, dict):
+            chats = chats.get("chats")
+        if not isinstance(chats, list) or not all(isinstance(chat, dict) for chat in chats):
+            raise ValueError("Expected a JSON array of chat requests")
+
+        smart = g_ctx.get_providers().get("smart_routing")
+        if not isinstance(smart, SmartRouterProvider):
+            raise Exception("Smart routing provider is not loaded")
+
+        responses = await smart.chat_batch(chats)
+        return web.json_response(
+            [{"error": str(response)} if isinstance(response, Exception) else response for response in responses]
+        )
+    except Exception as ex:
+        return web.json_response({"error": str(ex)}, status=400)
+
+
 async def get_stats_handler(request):
-    return web.json_response(g_stats)
+    return web.json_response(get_stats())
 
 
 def install(ctx):
@@ -569,16 +784,18 @@ def install(ctx):
     g_ctx = ctx
     ctx.add_get("config", get_config_handler)
     ctx.add_post("config", update_config_handler)
+    ctx.add_post("chat/batch", batch_chat_handler)
     ctx.add_get("stats", get_stats_handler)
 
 
 async def load(ctx):
     global g_config
     raw_config = _load_user_config()
-    g_config = normalize_config(raw_config)
+    smart = SmartRouterProvider(ctx, raw_config)
+    g_config = smart.config
 
     providers = ctx.get_providers()
-    providers["smart_routing"] = SmartRouterProvider(ctx, g_config)
+    providers["smart_routing"] = smart
 
     ctx.log("Smart routing enabled. Model 'auto' is now available.")
 
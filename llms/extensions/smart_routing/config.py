@@ -6,7 +6,8 @@ All routing parameters: keyword lists, dimension weights, tier boundaries,
 confidence calibration, and tier-to-model preferences.
 """
 
-from copy import deepcopy
+from collections.abc import Mapping
+from types import MappingProxyType
 
 TIERS = ("SIMPLE", "MEDIUM", "COMPLEX", "REASONING")
 
@@ -164,6 +165,17 @@ DEFAULT_SCORING_CONFIG = {
     "confidenceThreshold": 0.7,
 }
 
+# Keyword lists are matched case-insensitively; store them lowercased and as tuples
+# so config copies can share them instead of duplicating every list
+for _key, _value in DEFAULT_SCORING_CONFIG.items():
+    if isinstance(_value, list):
+        DEFAULT_SCORING_CONFIG[_key] = tuple(kw.lower() for kw in _value)
+    elif isinstance(_value, dict):
+        DEFAULT_SCORING_CONFIG[_key] = MappingProxyType(_value)
+del _key, _value
+# read-only view: normalized configs share the default subtrees, so they must never change
+DEFAULT_SCORING_CONFIG = MappingProxyType(DEFAULT_SCORING_CONFIG)
+
 # Tier-to-model preferences (model short names matched against llmspy providers)
 DEFAULT_TIER_PREFERENCES = {
     "SIMPLE": {
@@ -225,9 +237,13 @@ DEFAULT_OVERRIDES = {
     "structuredOutputMinTier": "MEDIUM",
     "ambiguousDefaultTier": "MEDIUM",
     "agenticMode": False,
+    # Race the top N candidates concurrently (0 or 1 = try candidates sequentially)
+    "parallelFallback": 0,
+    # Most chats of one /chat/batch request dispatched at the same time
+    "batchConcurrency": 8,
 }
 
-TIER_RANK = {"SIMPLE": 0, "MEDIUM": 1, "COMPLEX": 2, "REASONING": 3}
+TIER_RANK = {tier: rank for rank, tier in enumerate(TIERS)}
 
 # Cost thresholds per tier (input cost per 1M tokens) for fallback selection
 TIER_COST_THRESHOLDS = {
@@ -237,13 +253,25 @@ TIER_COST_THRESHOLDS = {
     "REASONING": 50.0,
 }
 
-DEFAULT_CONFIG = {
-    "scoring": DEFAULT_SCORING_CONFIG,
-    "overrides": DEFAULT_OVERRIDES,
-    "tierPreferences": DEFAULT_TIER_PREFERENCES,
-    "agenticPreferences": DEFAULT_AGENTIC_PREFERENCES,
-}
+# read-only at the top level and in "scoring"; the other sections are plain dicts that must not be
+# edited in place. json.dumps()/deepcopy() need the plain copy from default_config()
+DEFAULT_CONFIG = MappingProxyType(
+    {
+        "scoring": DEFAULT_SCORING_CONFIG,
+        "overrides": DEFAULT_OVERRIDES,
+        "tierPreferences": DEFAULT_TIER_PREFERENCES,
+        "agenticPreferences": DEFAULT_AGENTIC_PREFERENCES,
+    }
+)
+
+
+def _thaw(value):
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_thaw(item) for item in value]
+    return value
 
 
 def default_config():
-    return deepcopy(DEFAULT_CONFIG)
+    return _thaw(DEFAULT_CONFIG)
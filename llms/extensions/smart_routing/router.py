@@ -13,7 +13,8 @@ from .config import (
     TIER_COST_THRESHOLDS,
 )
 
-Candidate = Tuple[str, str, Dict[str, Any]]
+# (provider_id, model_id, model_info, provider)
+Candidate = Tuple[str, str, Dict[str, Any], Any]
 
 
 def select_provider(
@@ -29,6 +30,7 @@ def select_provider(
         providers,
         preferences=preferences,
         agentic_preferences=agentic_preferences,
+        limit=1,
     )
     return ranked[0] if ranked else None
 
@@ -39,7 +41,12 @@ def rank_candidates(
     providers: Dict[str, Any],
     preferences: Optional[Dict[str, Any]] = None,
     agentic_preferences: Optional[Dict[str, Any]] = None,
+    limit: Optional[int] = None,
 ) -> List[Candidate]:
+    """
+    Candidates for a tier, best first. With `limit`, at most that many are returned and
+    the cost fallback scan is skipped once the preferred models alone fill the limit.
+    """
     prefs = _tier_preferences(agentic, preferences, agentic_preferences)
     tier_pref = prefs.get(tier) or {}
     required_caps = tier_pref.get("capabilities", {}) if isinstance(tier_pref, dict) else {}
@@ -49,12 +56,18 @@ def rank_candidates(
 
     for preferred_model in preferred_models:
         candidates.extend(_find_provider_candidates_for_model(str(preferred_model), providers, required_caps))
+        if limit is not None and len(candidates) >= limit:
+            # later candidates can only come after these, so the head of the ranking is settled
+            deduped = _dedupe_candidates(candidates)
+            if len(deduped) >= limit:
+                return deduped[:limit]
 
     candidates.extend(_fallback_by_cost_candidates(tier, providers, required_caps))
     if not candidates:
         candidates.extend(_any_available_models(providers))
 
-    return _dedupe_candidates(candidates)
+    ranked = _dedupe_candidates(candidates)
+    return ranked[:limit] if limit is not None else ranked
 
 
 def _tier_preferences(
@@ -72,7 +85,8 @@ def _find_provider_candidates_for_model(
     providers: Dict[str, Any],
     required_caps: Dict[str, Any],
 ) -> List[Candidate]:
-    ranked: List[Tuple[float, Candidate]] = []
+    costs: List[float] = []
+    candidates: List[Candidate] = []
     for provider_id, provider in providers.items():
         if provider_id == "smart_routing":
             continue
@@ -84,10 +98,10 @@ def _find_provider_candidates_for_model(
         info = _model_info(provider, model_name, resolved)
         if not info or not _meets_capabilities(info, required_caps):
             continue
-        ranked.append((_input_cost(info), (provider_id, resolved, info)))
+        costs.append(_input_cost(info))
+        candidates.append((provider_id, resolved, info, provider))
 
-    ranked.sort(key=lambda item: item[0])
-    return [candidate for _cost, candidate in ranked]
+    return _sort_by_cost(costs, candidates)
 
 
 def _meets_capabilities(model_info: Dict[str, Any], required_caps: Dict[str, Any]) -> bool:
@@ -105,7 +119,8 @@ def _fallback_by_cost_candidates(
     required_caps: Dict[str, Any],
 ) -> List[Candidate]:
     max_cost = float(TIER_COST_THRESHOLDS.get(tier, 50.0))
-    ranked: List[Tuple[float, Candidate]] = []
+    costs: List[float] = []
+    candidates: List[Candidate] = []
 
     for provider_id, provider in providers.items():
         if provider_id == "smart_routing":
@@ -119,10 +134,15 @@ def _fallback_by_cost_candidates(
                 continue
             input_cost = _input_cost(model_info)
             if input_cost <= max_cost:
-                ranked.append((input_cost, (provider_id, str(model_id), model_info)))
+                costs.append(input_cost)
+                candidates.append((provider_id, str(model_id), model_info, provider))
+
+    return _sort_by_cost(costs, candidates)
+
 
-    ranked.sort(key=lambda item: item[0])
-    return [candidate for _cost, candidate in ranked]
+def _sort_by_cost(costs: List[float], candidates: List[Candidate]) -> List[Candidate]:
+    order = sorted(range(len(costs)), key=costs.__getitem__)
+    return [candidates[index] for index in order]
 
 
 def _any_available_models(providers: Dict[str, Any]) -> List[Candidate]:
@@ -133,7 +153,7 @@ def _any_available_models(providers: Dict[str, Any]) -> List[Candidate]:
         models = getattr(provider, "models", {}) or {}
         for model_id, model_info in models.items():
             if isinstance(model_info, dict):
-                ret.append((provider_id, str(model_id), model_info))
+                ret.append((provider_id, str(model_id), model_info, provider))
     return ret
 
 
@@ -6,210 +6,266 @@ from __future__ import annotations
 
 import math
 import re
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
 
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(frozen=True, **_SLOTS)
 class ScoringResult:
     score: float
     tier: Optional[str]
     confidence: float
-    signals: List[str] = field(default_factory=list)
+    signals: Tuple[str, ...] = ()
     agentic_score: float = 0.0
 
 
-DimensionScore = Tuple[str, float, Optional[str]]
+# (score, signal or None)
+DimensionScore = Tuple[float, Optional[str]]
+
+KEYWORD_LISTS = (
+    "codeKeywords",
+    "reasoningKeywords",
+    "simpleKeywords",
+    "technicalKeywords",
+    "creativeKeywords",
+    "imperativeVerbs",
+    "constraintIndicators",
+    "outputFormatKeywords",
+    "referenceKeywords",
+    "negationKeywords",
+    "domainSpecificKeywords",
+    "agenticTaskKeywords",
+)
+
+# keyword lists matched against the user prompt only; the rest scan system + user text
+_USER_TEXT_KEYWORD_LISTS = ("reasoningKeywords",)
+
+KeywordVocab = Dict[str, Tuple[str, ...]]
+# (distinct keywords across a group of lists, bucketed by first character,
+#  keyword -> ((list key, index in list), ...))
+KeywordSweep = Tuple[Dict[str, Tuple[str, ...]], Dict[str, Tuple[Tuple[str, int], ...]]]
+
+# (keyword list, dimension, signal label, low / high match thresholds, low / high scores);
+# every keyword dimension scores 0 below its low threshold
+KeywordDimension = Tuple[str, str, str, int, int, float, float]
+
+# keyword dimensions scored before and after the multi-step / question dimensions
+_LEADING_KEYWORD_DIMENSIONS: Tuple[KeywordDimension, ...] = (
+    ("codeKeywords", "codePresence", "code", 1, 2, 0.5, 1.0),
+    ("reasoningKeywords", "reasoningMarkers", "reasoning", 1, 2, 0.7, 1.0),
+    ("technicalKeywords", "technicalTerms", "technical", 2, 4, 0.5, 1.0),
+    ("creativeKeywords", "creativeMarkers", "creative", 1, 2, 0.5, 0.7),
+    ("simpleKeywords", "simpleIndicators", "simple", 1, 2, -1.0, -1.0),
+)
+_TRAILING_KEYWORD_DIMENSIONS: Tuple[KeywordDimension, ...] = (
+    ("imperativeVerbs", "imperativeVerbs", "imperative", 1, 2, 0.3, 0.5),
+    ("constraintIndicators", "constraintCount", "constraints", 1, 3, 0.3, 0.7),
+    ("outputFormatKeywords", "outputFormat", "format", 1, 2, 0.4, 0.7),
+    ("referenceKeywords", "referenceComplexity", "references", 1, 2, 0.3, 0.5),
+    ("negationKeywords", "negationComplexity", "negation", 2, 3, 0.3, 0.5),
+    ("domainSpecificKeywords", "domainSpecificity", "domain-specific", 1, 2, 0.5, 0.8),
+)
+
+# "first ... then", "step N" or a numbered list item
+_MULTI_STEP_RE = re.compile(r"first.*?then|step \d|\d\.\s")
+
+# (hash(prompt), hash(system prompt), estimated tokens) -> result, kept in LRU order
+ResultCache = Dict[Tuple[int, int, int], ScoringResult]
+
+# (keyword list, signal label, low / high match thresholds, weighted low / high scores)
+KeywordDimensionPlan = Tuple[str, str, int, int, float, float]
+
+
+class ScoringPlan(NamedTuple):
+    """Scoring constants of one config, cast and weighted once instead of per classify()."""
+
+    token_simple: int
+    token_complex: int
+    token_weight: float
+    leading: Tuple[KeywordDimensionPlan, ...]
+    multi_step_weight: float
+    question_weight: float
+    trailing: Tuple[KeywordDimensionPlan, ...]
+    agentic_weight: float
+    steepness: float
+    simple_medium: float
+    medium_complex: float
+    complex_reasoning: float
+    confidence_threshold: float
+
+
+class ConfigTables(NamedTuple):
+    vocab: KeywordVocab
+    text_sweep: KeywordSweep
+    user_sweep: KeywordSweep
+    plan: ScoringPlan
+    results: ResultCache
+
+
+_VOCAB_CACHE_SIZE = 8
+_RESULT_CACHE_SIZE = 1024
+# id(config) -> (config, tables); the config is held so its id cannot be reused while cached
+_vocab_cache: Dict[int, Tuple[Dict[str, Any], ConfigTables]] = {}
+
+
+def _build_sweep(vocab: KeywordVocab, keys: Tuple[str, ...]) -> KeywordSweep:
+    owners: Dict[str, List[Tuple[str, int]]] = {}
+    for key in keys:
+        for index, keyword in enumerate(vocab[key]):
+            owners.setdefault(keyword, []).append((key, index))
+    buckets: Dict[str, List[str]] = {}
+    for keyword in owners:
+        # an empty keyword matches everything, so bucket it under "" and always scan it
+        buckets.setdefault(keyword[:1], []).append(keyword)
+    return (
+        {first: tuple(keywords) for first, keywords in buckets.items()},
+        {keyword: tuple(entries) for keyword, entries in owners.items()},
+    )
+
+
+def _keyword_dimension_plans(
+    dimensions: Tuple[KeywordDimension, ...], weights: Dict[str, Any]
+) -> Tuple[KeywordDimensionPlan, ...]:
+    plans = []
+    for key, name, label, low, high, low_score, high_score in dimensions:
+        weight = float(weights.get(name, 0.0))
+        plans.append((key, label, low, high, low_score * weight, high_score * weight))
+    return tuple(plans)
+
+
+def _scoring_plan(config: Dict[str, Any]) -> ScoringPlan:
+    thresholds = config.get("tokenCountThresholds", {})
+    weights = config.get("dimensionWeights", {})
+    boundaries = config.get("tierBoundaries", {})
+    return ScoringPlan(
+        token_simple=int(thresholds.get("simple", 50)),
+        token_complex=int(thresholds.get("complex", 500)),
+        token_weight=float(weights.get("tokenCount", 0.0)),
+        leading=_keyword_dimension_plans(_LEADING_KEYWORD_DIMENSIONS, weights),
+        multi_step_weight=float(weights.get("multiStepPatterns", 0.0)),
+        question_weight=float(weights.get("questionComplexity", 0.0)),
+        trailing=_keyword_dimension_plans(_TRAILING_KEYWORD_DIMENSIONS, weights),
+        agentic_weight=float(weights.get("agenticTask", 0.0)),
+        steepness=float(config.get("confidenceSteepness", 12)),
+        simple_medium=float(boundaries.get("simpleMedium", 0.0)),
+        medium_complex=float(boundaries.get("mediumComplex", 0.18)),
+        complex_reasoning=float(boundaries.get("complexReasoning", 0.4)),
+        confidence_threshold=float(config.get("confidenceThreshold", 0.7)),
+    )
+
+
+def _config_tables(config: Dict[str, Any]) -> ConfigTables:
+    """
+    Lowercased keyword tuples for a scoring config plus deduplicated sweep tables
+    that let one pass over each scanned text match every list scored against it,
+    the pre-cast scoring plan, and the config's classification LRU.
+    Built once per config object; configs are treated as read-only once passed to classify().
+    """
+    entry = _vocab_cache.get(id(config))
+    if entry is not None and entry[0] is config:
+        return entry[1]
+    vocab = {key: tuple(kw.lower() for kw in config.get(key, [])) for key in KEYWORD_LISTS}
+    tables = ConfigTables(
+        vocab=vocab,
+        text_sweep=_build_sweep(vocab, tuple(key for key in KEYWORD_LISTS if key not in _USER_TEXT_KEYWORD_LISTS)),
+        user_sweep=_build_sweep(vocab, _USER_TEXT_KEYWORD_LISTS),
+        plan=_scoring_plan(config),
+        results=OrderedDict(),
+    )
+    if len(_vocab_cache) >= _VOCAB_CACHE_SIZE:
+        _vocab_cache.pop(next(iter(_vocab_cache)))
+    _vocab_cache[id(config)] = (config, tables)
+    return tables
+
 
+def _sweep_keywords(
+    text: str, vocab: KeywordVocab, sweep: KeywordSweep, matches: Optional[Dict[str, List[str]]] = None
+) -> Dict[str, List[str]]:
+    """Match every list in a sweep in one pass; adds per-list matches in list order to `matches`."""
+    # substring tests rather than a regex alternation, which would miss overlapping keywords
+    buckets, owners = sweep
+    firsts = buckets.keys() & set(text)
+    if "" in buckets:
+        firsts.add("")
+    hits: Dict[str, List[int]] = {}
+    for keyword in [kw for first in firsts for kw in buckets[first] if kw in text]:
+        for key, index in owners[keyword]:
+            hits.setdefault(key, []).append(index)
+    if matches is None:
+        matches = {}
+    for key, indexes in hits.items():
+        matches[key] = [vocab[key][index] for index in sorted(indexes)]
+    return matches
 
-def _score_token_count(estimated_tokens: int, thresholds: Dict[str, Any]) -> DimensionScore:
-    simple_threshold = int(thresholds.get("simple", 50))
-    complex_threshold = int(thresholds.get("complex", 500))
+
+def _score_token_count(estimated_tokens: int, simple_threshold: int, complex_threshold: int) -> DimensionScore:
     if estimated_tokens < simple_threshold:
-        return "tokenCount", -1.0, "short (%d tokens)" % estimated_tokens
+        return -1.0, "short (%d tokens)" % estimated_tokens
     if estimated_tokens > complex_threshold:
-        return "tokenCount", 1.0, "long (%d tokens)" % estimated_tokens
-    return "tokenCount", 0.0, None
-
-
-def _score_keyword_match(
-    text: str,
-    keywords: List[str],
-    name: str,
-    signal_label: str,
-    thresholds: Dict[str, int],
-    scores: Dict[str, float],
-) -> DimensionScore:
-    matches = [kw for kw in keywords if kw.lower() in text]
-    if len(matches) >= int(thresholds.get("high", 2)):
-        return name, float(scores.get("high", 0.0)), "%s (%s)" % (signal_label, ", ".join(matches[:3]))
-    if len(matches) >= int(thresholds.get("low", 1)):
-        return name, float(scores.get("low", 0.0)), "%s (%s)" % (signal_label, ", ".join(matches[:3]))
-    return name, float(scores.get("none", 0.0)), None
+        return 1.0, "long (%d tokens)" % estimated_tokens
+    return 0.0, None
+
+
+def _add_keyword_dimensions(
+    dimensions: Tuple[KeywordDimensionPlan, ...],
+    matches: Dict[str, List[str]],
+    weighted_score: float,
+    signals: List[str],
+) -> float:
+    """Fold keyword dimensions into the running weighted score, in table order."""
+    for key, label, low, high, low_term, high_term in dimensions:
+        found = matches.get(key)
+        if found is None or len(found) < low:
+            continue
+        weighted_score += high_term if len(found) >= high else low_term
+        signals.append("%s (%s)" % (label, ", ".join(found[:3])))
+    return weighted_score
 
 
 def _score_multi_step(text: str) -> DimensionScore:
-    patterns = [r"first.*then", r"step \d", r"\d\.\s"]
-    for pattern in patterns:
-        if re.search(pattern, text, re.IGNORECASE):
-            return "multiStepPatterns", 0.5, "multi-step"
-    return "multiStepPatterns", 0.0, None
+    # text is already lowercased by classify()
+    if _MULTI_STEP_RE.search(text):
+        return 0.5, "multi-step"
+    return 0.0, None
 
 
 def _score_question_complexity(prompt: str) -> DimensionScore:
     count = prompt.count("?")
     if count > 3:
-        return "questionComplexity", 0.5, "%d questions" % count
-    return "questionComplexity", 0.0, None
+        return 0.5, "%d questions" % count
+    return 0.0, None
 
 
-def _score_agentic_task(text: str, keywords: List[str]) -> Tuple[DimensionScore, float]:
-    match_count = 0
-    signals = []
-    for keyword in keywords:
-        if keyword.lower() in text:
-            match_count += 1
-            if len(signals) < 3:
-                signals.append(keyword)
+def _score_agentic_task(matches: List[str]) -> DimensionScore:
+    match_count = len(matches)
+    signals = matches[:3]
 
     if match_count >= 4:
-        return ("agenticTask", 1.0, "agentic (%s)" % ", ".join(signals)), 1.0
+        return 1.0, "agentic (%s)" % ", ".join(signals)
     if match_count >= 3:
-        return ("agenticTask", 0.6, "agentic (%s)" % ", ".join(signals)), 0.6
+        return 0.6, "agentic (%s)" % ", ".join(signals)
     if match_count >= 1:
-        return ("agenticTask", 0.2, "agentic-light (%s)" % ", ".join(signals)), 0.2
-    return ("agenticTask", 0.0, None), 0.0
+        return 0.2, "agentic-light (%s)" % ", ".join(signals)
+    return 0.0, None
 
 
 def _calibrate_confidence(distance: float, steepness: float) -> float:
     return 1.0 / (1.0 + math.exp(-steepness * distance))
 
 
-def classify(prompt: str, system_prompt: Optional[str], estimated_tokens: int, config: Dict[str, Any]) -> ScoringResult:
-    text = ("%s %s" % (system_prompt or "", prompt or "")).lower()
-    user_text = (prompt or "").lower()
-
-    dimensions = [
-        _score_token_count(estimated_tokens, config.get("tokenCountThresholds", {})),
-        _score_keyword_match(
-            text,
-            config.get("codeKeywords", []),
-            "codePresence",
-            "code",
-            {"low": 1, "high": 2},
-            {"none": 0, "low": 0.5, "high": 1.0},
-        ),
-        _score_keyword_match(
-            user_text,
-            config.get("reasoningKeywords", []),
-            "reasoningMarkers",
-            "reasoning",
-            {"low": 1, "high": 2},
-            {"none": 0, "low": 0.7, "high": 1.0},
-        ),
-        _score_keyword_match(
-            text,
-            config.get("technicalKeywords", []),
-            "technicalTerms",
-            "technical",
-            {"low": 2, "high": 4},
-            {"none": 0, "low": 0.5, "high": 1.0},
-        ),
-        _score_keyword_match(
-            text,
-            config.get("creativeKeywords", []),
-            "creativeMarkers",
-            "creative",
-            {"low": 1, "high": 2},
-            {"none": 0, "low": 0.5, "high": 0.7},
-        ),
-        _score_keyword_match(
-            text,
-            config.get("simpleKeywords", []),
-            "simpleIndicators",
-            "simple",
-            {"low": 1, "high": 2},
-            {"none": 0, "low": -1.0, "high": -1.0},
-        ),
-        _score_multi_step(text),
-        _score_question_complexity(prompt or ""),
-        _score_keyword_match(
-            text,
-            config.get("imperativeVerbs", []),
-            "imperativeVerbs",
-            "imperative",
-            {"low": 1, "high": 2},
-            {"none": 0, "low": 0.3, "high": 0.5},
-        ),
-        _score_keyword_match(
-            text,
-            config.get("constraintIndicators", []),
-            "constraintCount",
-            "constraints",
-            {"low": 1, "high": 3},
-            {"none": 0, "low": 0.3, "high": 0.7},
-        ),
-        _score_keyword_match(
-            text,
-            config.get("outputFormatKeywords", []),
-            "outputFormat",
-            "format",
-            {"low": 1, "high": 2},
-            {"none": 0, "low": 0.4, "high": 0.7},
-        ),
-        _score_keyword_match(
-            text,
-            config.get("referenceKeywords", []),
-            "referenceComplexity",
-            "references",
-            {"low": 1, "high": 2},
-            {"none": 0, "low": 0.3, "high": 0.5},
-        ),
-        _score_keyword_match(
-            text,
-            config.get("negationKeywords", []),
-            "negationComplexity",
-            "negation",
-            {"low": 2, "high": 3},
-            {"none": 0, "low": 0.3, "high": 0.5},
-        ),
-        _score_keyword_match(
-            text,
-            config.get("domainSpecificKeywords", []),
-            "domainSpecificity",
-            "domain-specific",
-            {"low": 1, "high": 2},
-            {"none": 0, "low": 0.5, "high": 0.8},
-        ),
-    ]
-
-    agentic_dim, agentic_score = _score_agentic_task(text, config.get("agenticTaskKeywords", []))
-    dimensions.append(agentic_dim)
-
-    signals = [signal for _, _, signal in dimensions if signal]
-
-    weights = config.get("dimensionWeights", {})
-    weighted_score = 0.0
-    for name, score, _signal in dimensions:
-        weighted_score += float(score) * float(weights.get(name, 0.0))
-
-    reasoning_matches = [kw for kw in config.get("reasoningKeywords", []) if kw.lower() in user_text]
-    steepness = float(config.get("confidenceSteepness", 12))
-
-    if len(reasoning_matches) >= 2:
-        confidence = _calibrate_confidence(max(weighted_score, 0.3), steepness)
-        return ScoringResult(
-            score=weighted_score,
-            tier="REASONING",
-            confidence=max(confidence, 0.85),
-            signals=signals,
-            agentic_score=agentic_score,
-        )
+def _finalize(weighted_score: float, reasoning_override: bool, plan: ScoringPlan) -> Tuple[Optional[str], float]:
+    """Map a weighted score to (tier or None when ambiguous, calibrated confidence)."""
+    if reasoning_override:
+        confidence = _calibrate_confidence(max(weighted_score, 0.3), plan.steepness)
+        return "REASONING", max(confidence, 0.85)
 
-    boundaries = config.get("tierBoundaries", {})
-    simple_medium = float(boundaries.get("simpleMedium", 0.0))
-    medium_complex = float(boundaries.get("mediumComplex", 0.18))
-    complex_reasoning = float(boundaries.get("complexReasoning", 0.4))
+    simple_medium = plan.simple_medium
+    medium_complex = plan.medium_complex
+    complex_reasoning = plan.complex_reasoning
 
     if weighted_score < simple_medium:
         tier = "SIMPLE"
@@ -224,21 +280,76 @@ def classify(prompt: str, system_prompt: Optional[str], estimated_tokens: int, c
         tier = "REASONING"
         distance = weighted_score - complex_reasoning
 
-    confidence = _calibrate_confidence(distance, steepness)
-    threshold = float(config.get("confidenceThreshold", 0.7))
-    if confidence < threshold:
-        return ScoringResult(
-            score=weighted_score,
-            tier=None,
-            confidence=confidence,
-            signals=signals,
-            agentic_score=agentic_score,
-        )
+    confidence = _calibrate_confidence(distance, plan.steepness)
+    if confidence < plan.confidence_threshold:
+        return None, confidence
+    return tier, confidence
+
+
+def classify(prompt: str, system_prompt: Optional[str], estimated_tokens: int, config: Dict[str, Any]) -> ScoringResult:
+    return _cached_classify(prompt, system_prompt, estimated_tokens, _config_tables(config))
+
+
+def classify_batch(items: Iterable[Tuple[str, Optional[str], int]], config: Dict[str, Any]) -> List[ScoringResult]:
+    """Classify (prompt, system_prompt, estimated_tokens) items against one config, in order."""
+    tables = _config_tables(config)
+    return [
+        _cached_classify(prompt, system_prompt, estimated_tokens, tables)
+        for prompt, system_prompt, estimated_tokens in items
+    ]
+
+
+def _cached_classify(
+    prompt: str, system_prompt: Optional[str], estimated_tokens: int, tables: ConfigTables
+) -> ScoringResult:
+    results = tables.results
+    key = (hash(prompt), hash(system_prompt or ""), estimated_tokens)
+    result = results.get(key)
+    if result is not None:
+        results.move_to_end(key)
+        return result
+    result = _classify(prompt, system_prompt, estimated_tokens, tables)
+    results[key] = result
+    if len(results) > _RESULT_CACHE_SIZE:
+        results.popitem(last=False)
+    return result
+
+
+def _classify(prompt: str, system_prompt: Optional[str], estimated_tokens: int, tables: ConfigTables) -> ScoringResult:
+    vocab = tables.vocab
+    plan = tables.plan
+    # the separating space keeps case mapping (e.g. final sigma) independent of the other part
+    user_text = (prompt or "").lower()
+    text = "%s %s" % (system_prompt.lower(), user_text) if system_prompt else " " + user_text
+    matches = _sweep_keywords(user_text, vocab, tables.user_sweep, _sweep_keywords(text, vocab, tables.text_sweep))
+    reasoning_matches = matches.get("reasoningKeywords", [])
+
+    signals: List[str] = []
+    weighted_score = 0.0
+    score, signal = _score_token_count(estimated_tokens, plan.token_simple, plan.token_complex)
+    weighted_score += score * plan.token_weight
+    if signal:
+        signals.append(signal)
+    weighted_score = _add_keyword_dimensions(plan.leading, matches, weighted_score, signals)
+    score, signal = _score_multi_step(text)
+    weighted_score += score * plan.multi_step_weight
+    if signal:
+        signals.append(signal)
+    score, signal = _score_question_complexity(prompt or "")
+    weighted_score += score * plan.question_weight
+    if signal:
+        signals.append(signal)
+    weighted_score = _add_keyword_dimensions(plan.trailing, matches, weighted_score, signals)
+    agentic_score, signal = _score_agentic_task(matches.get("agenticTaskKeywords", []))
+    weighted_score += agentic_score * plan.agentic_weight
+    if signal:
+        signals.append(signal)
 
+    tier, confidence = _finalize(weighted_score, len(reasoning_matches) >= 2, plan)
     return ScoringResult(
         score=weighted_score,
         tier=tier,
         confidence=confidence,
-        signals=signals,
+        signals=tuple(signals),
         agentic_score=agentic_score,
     )
@@ -4,6 +4,7 @@ Unit tests for smart routing extension behavior.
 """
 
 import asyncio
+import json
 import os
 import sys
 import unittest
@@ -11,9 +12,10 @@ import unittest
 # Add parent directory to path to import llms module
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from llms.extensions.smart_routing import SmartRouterProvider, normalize_config
-from llms.extensions.smart_routing.config import DEFAULT_SCORING_CONFIG
-from llms.extensions.smart_routing.scorer import classify
+from llms.extensions.smart_routing import SmartRouterProvider, _deep_merge, get_stats, normalize_config
+from llms.extensions.smart_routing.config import DEFAULT_SCORING_CONFIG, default_config
+from llms.extensions.smart_routing.router import rank_candidates, select_provider
+from llms.extensions.smart_routing.scorer import classify, classify_batch
 
 
 class DummyProvider:
@@ -77,6 +79,22 @@ class TestSmartRoutingScorer(unittest.TestCase):
         self.assertEqual(result.tier, "REASONING")
         self.assertGreaterEqual(result.confidence, 0.85)
 
+    def test_repeated_prompts_reuse_classification(self):
+        config = normalize_config({})["scoring"]
+        first = classify("What is Python?", None, 4, config)
+        second = classify("What is Python?", None, 4, config)
+        self.assertIs(first, second)
+        self.assertIsNot(classify("What is Rust?", None, 4, config), first)
+        self.assertIsNot(classify("What is Python?", None, 4, normalize_config({})["scoring"]), first)
+
+    def test_classify_batch_matches_classify(self):
+        items = [("What is Python?", None, 4), ("Prove this theorem step by step", "Be formal.", 9)]
+        batch = classify_batch(items, normalize_config({})["scoring"])
+        # a separately normalized config has its own result cache, so classify() recomputes
+        fresh = normalize_config({})["scoring"]
+        self.assertEqual(batch, [classify(*item, fresh) for item in items])
+        self.assertEqual([result.tier for result in batch], ["SIMPLE", "REASONING"])
+
 
 class TestSmartRoutingConfig(unittest.TestCase):
     def test_partial_scoring_override_preserves_defaults(self):
@@ -86,6 +104,45 @@ class TestSmartRoutingConfig(unittest.TestCase):
         self.assertIn("tokenCountThresholds", config["scoring"])
         self.assertIn("codeKeywords", config["scoring"])
 
+    def test_unchanged_sections_reuse_previous_normalization(self):
+        ctx = DummyCtx({})
+        first = SmartRouterProvider(ctx, {"overrides": {"agenticMode": False}})
+        second = SmartRouterProvider(ctx, {"overrides": {"agenticMode": True}}, previous=first)
+        self.assertIs(second.scoring_config, first.scoring_config)
+        self.assertIs(second.tier_preferences, first.tier_preferences)
+        self.assertIsNot(second.overrides, first.overrides)
+        self.assertTrue(second.overrides["agenticMode"])
+
+    def test_default_config_is_an_independent_plain_copy(self):
+        config = default_config()
+        json.dumps(config)
+        config["scoring"]["codeKeywords"].append("extra")
+        config["overrides"]["agenticMode"] = True
+        config["tierPreferences"]["SIMPLE"]["preferred_models"].append("extra")
+        self.assertNotIn("extra", DEFAULT_SCORING_CONFIG["codeKeywords"])
+        self.assertFalse(default_config()["overrides"]["agenticMode"])
+        self.assertNotIn("extra", normalize_config({})["tierPreferences"]["SIMPLE"]["preferred_models"])
+
+    def test_deep_merge_does_not_mutate_inputs(self):
+        base = {"a": {"b": {"c": 1, "d": [1]}}, "e": 1}
+        override = {"a": {"b": {"c": 2}, "f": {"g": [2]}}}
+        merged = _deep_merge(base, override)
+        self.assertEqual(merged, {"a": {"b": {"c": 2, "d": [1]}, "f": {"g": [2]}}, "e": 1})
+        self.assertEqual(base["a"]["b"]["c"], 1)
+        merged["a"]["f"]["g"].append(3)
+        self.assertEqual(override["a"]["f"]["g"], [2])
+
+
+class TestSmartRoutingRouter(unittest.TestCase):
+    def test_limited_ranking_matches_head_of_full_ranking(self):
+        providers = {
+            "provider_a": DummyProvider("provider_a", {"flash": {"id": "gemini-2.5-flash", "cost": {"input": 0.3}}}),
+            "provider_b": DummyProvider("provider_b", {"mini": {"id": "gpt-4o-mini", "cost": {"input": 0.1}}}),
+        }
+        full = rank_candidates("SIMPLE", False, providers)
+        self.assertEqual(rank_candidates("SIMPLE", False, providers, limit=1), full[:1])
+        self.assertEqual(select_provider("SIMPLE", False, providers), full[0])
+
 
 class TestSmartRoutingProvider(unittest.TestCase):
     def test_provider_fallback_when_first_candidate_fails(self):
@@ -103,14 +160,220 @@ class TestSmartRoutingProvider(unittest.TestCase):
             smart = SmartRouterProvider(ctx)
             chat = {"model": "auto", "messages": [{"role": "user", "content": "What is Python?"}]}
             context = {}
+            stats_before = get_stats()
+
+            response = await smart.chat(chat, context=context)
+            self.assertEqual(response["routing"]["provider"], "provider_b")
+            self.assertEqual(response["routing"]["attempts"], 2)
+            self.assertEqual(context["_smart_routing_selection"]["provider"], "provider_b")
+            self.assertEqual(chat["model"], "auto")
+            stats_after = get_stats()
+            self.assertEqual(stats_after["candidate_failures"], stats_before["candidate_failures"] + 1)
+            self.assertEqual(stats_after["providers"]["provider_b"], stats_before["providers"].get("provider_b", 0) + 1)
+
+        asyncio.run(run_test())
+
+    def test_parallel_fallback_races_candidates(self):
+        async def run_test():
+            provider_a = DummyProvider(
+                "provider_a",
+                {"gemini-2.5-flash": {"id": "gemini-2.5-flash", "cost": {"input": 0.1, "output": 0.3}}},
+                fail_calls=1,
+            )
+            provider_b = DummyProvider(
+                "provider_b",
+                {"gemini-2.5-flash": {"id": "gemini-2.5-flash", "cost": {"input": 0.2, "output": 0.3}}},
+            )
+            ctx = DummyCtx({"provider_a": provider_a, "provider_b": provider_b})
+            smart = SmartRouterProvider(ctx, {"overrides": {"parallelFallback": 2}})
+            chat = {"model": "auto", "messages": [{"role": "user", "content": "What is Python?"}]}
+            context = {}
 
             response = await smart.chat(chat, context=context)
             self.assertEqual(response["routing"]["provider"], "provider_b")
             self.assertEqual(response["routing"]["attempts"], 2)
+            self.assertEqual(provider_a.calls, 1)
+            self.assertEqual(provider_b.calls, 1)
+            self.assertEqual(context["provider"], "provider_b")
             self.assertEqual(context["_smart_routing_selection"]["provider"], "provider_b")
 
         asyncio.run(run_test())
 
+    def test_parallel_win_by_top_candidate_is_not_a_fallback(self):
+        async def run_test():
+            provider_a = DummyProvider(
+                "provider_a",
+                {"gemini-2.5-flash": {"id": "gemini-2.5-flash", "cost": {"input": 0.1, "output": 0.3}}},
+            )
+            provider_b = DummyProvider(
+                "provider_b",
+                {"gemini-2.5-flash": {"id": "gemini-2.5-flash", "cost": {"input": 0.2, "output": 0.3}}},
+            )
+            ctx = DummyCtx({"provider_a": provider_a, "provider_b": provider_b})
+            smart = SmartRouterProvider(ctx, {"overrides": {"parallelFallback": 2}})
+            chat = {"model": "auto", "messages": [{"role": "user", "content": "What is Python?"}]}
+            stats_before = get_stats()
+
+            response = await smart.chat(chat, context={})
+            self.assertEqual(response["routing"]["provider"], "provider_a")
+            self.assertEqual(response["routing"]["attempts"], 1)
+            stats_after = get_stats()
+            self.assertEqual(stats_after["fallback_attempts"], stats_before["fallback_attempts"])
+            self.assertEqual(stats_after["candidate_failures"], stats_before["candidate_failures"])
+
+        asyncio.run(run_test())
+
+    def test_parallel_records_failures_finishing_with_the_winner(self):
+        async def run_test():
+            provider_a = DummyProvider(
+                "provider_a",
+                {"gemini-2.5-flash": {"id": "gemini-2.5-flash", "cost": {"input": 0.1, "output": 0.3}}},
+            )
+            provider_b = DummyProvider(
+                "provider_b",
+                {"gemini-2.5-flash": {"id": "gemini-2.5-flash", "cost": {"input": 0.2, "output": 0.3}}},
+                fail_calls=1,
+            )
+            ctx = DummyCtx({"provider_a": provider_a, "provider_b": provider_b})
+            smart = SmartRouterProvider(ctx, {"overrides": {"parallelFallback": 2}})
+            chat = {"model": "auto", "messages": [{"role": "user", "content": "What is Python?"}]}
+            stats_before = get_stats()
+
+            response = await smart.chat(chat, context={})
+            self.assertEqual(response["routing"]["provider"], "provider_a")
+            self.assertEqual(response["routing"]["attempts"], 2)
+            self.assertEqual(provider_b.calls, 1)
+            stats_after = get_stats()
+            self.assertEqual(stats_after["fallback_attempts"], stats_before["fallback_attempts"])
+            self.assertEqual(stats_after["candidate_failures"], stats_before["candidate_failures"] + 1)
+            self.assertTrue(any("Candidate failed provider_b" in line for line in ctx.logs))
+
+        asyncio.run(run_test())
+
+    def test_parallel_falls_back_sequentially_when_every_raced_candidate_fails(self):
+        async def run_test():
+            models = {"gemini-2.5-flash": {"id": "gemini-2.5-flash", "cost": {"input": 0.1, "output": 0.3}}}
+            provider_a = DummyProvider("provider_a", models, fail_calls=1)
+            provider_b = DummyProvider("provider_b", models, fail_calls=1)
+            provider_c = DummyProvider("provider_c", models)
+            ctx = DummyCtx({"provider_a": provider_a, "provider_b": provider_b, "provider_c": provider_c})
+            smart = SmartRouterProvider(ctx, {"overrides": {"parallelFallback": 2}})
+            chat = {"model": "auto", "messages": [{"role": "user", "content": "What is Python?"}]}
+            stats_before = get_stats()
+
+            response = await smart.chat(chat, context={})
+            self.assertEqual(response["routing"]["provider"], "provider_c")
+            self.assertEqual(response["routing"]["attempts"], 3)
+            self.assertEqual(chat["model"], "auto")
+            stats_after = get_stats()
+            self.assertEqual(stats_after["fallback_attempts"], stats_before["fallback_attempts"] + 2)
+            self.assertEqual(stats_after["candidate_failures"], stats_before["candidate_failures"] + 2)
+
+        asyncio.run(run_test())
+
+    def test_chat_batch_preserves_order_and_isolates_failures(self):
+        async def run_test():
+            provider_a = DummyProvider(
+                "provider_a",
+                {"flash": {"id": "flash", "cost": {"input": 0.1, "output": 0.2}}},
+            )
+            ctx = DummyCtx({"provider_a": provider_a})
+            smart = SmartRouterProvider(ctx)
+            chats = [
+                {"messages": [{"role": "user", "content": "What is Python?"}]},
+                {"messages": [{"role": "user", "content": "Prove the theorem step by step"}]},
+            ]
+
+            responses = await smart.chat_batch(chats)
+            self.assertEqual(len(responses), 2)
+            self.assertEqual(responses[0]["routing"]["tier"], "SIMPLE")
+            self.assertEqual(responses[1]["routing"]["tier"], "REASONING")
+            self.assertEqual(provider_a.calls, 2)
+
+            ctx._providers = {}
+            responses = await smart.chat_batch(chats[:1])
+            self.assertIsInstance(responses[0], Exception)
+
+        asyncio.run(run_test())
+
+    def test_chat_batch_isolates_a_failure_among_successes(self):
+        async def run_test():
+            provider_a = DummyProvider(
+                "provider_a",
+                {"flash": {"id": "flash", "cost": {"input": 0.1, "output": 0.2}}},
+                fail_calls=1,
+            )
+            ctx = DummyCtx({"provider_a": provider_a})
+            smart = SmartRouterProvider(ctx)
+            chats = [{"messages": [{"role": "user", "content": "What is Python?"}]} for _ in range(3)]
+
+            responses = await smart.chat_batch(chats)
+            self.assertIsInstance(responses[0], Exception)
+            self.assertEqual([response["routing"]["provider"] for response in responses[1:]], ["provider_a"] * 2)
+
+        asyncio.run(run_test())
+
+    def test_chat_batch_bounds_concurrent_dispatch(self):
+        class SlowProvider(DummyProvider):
+            active = 0
+            peak = 0
+
+            async def chat(self, chat, context=None):
+                SlowProvider.active += 1
+                SlowProvider.peak = max(SlowProvider.peak, SlowProvider.active)
+                await asyncio.sleep(0)
+                SlowProvider.active -= 1
+                return await super().chat(chat, context=context)
+
+        async def run_test():
+            provider_a = SlowProvider("provider_a", {"flash": {"id": "flash", "cost": {"input": 0.1, "output": 0.2}}})
+            ctx = DummyCtx({"provider_a": provider_a})
+            smart = SmartRouterProvider(ctx, {"overrides": {"batchConcurrency": 2}})
+            chats = [{"messages": [{"role": "user", "content": "What is Python?"}]} for _ in range(5)]
+
+            responses = await smart.chat_batch(chats)
+            self.assertEqual(len(responses), 5)
+            self.assertEqual(provider_a.calls, 5)
+            self.assertEqual(SlowProvider.peak, 2)
+
+        asyncio.run(run_test())
+
+    def test_rankings_are_cached_until_providers_change(self):
+        provider_a = DummyProvider("provider_a", {"flash": {"id": "flash", "cost": {"input": 0.1, "output": 0.2}}})
+        ctx = DummyCtx({"provider_a": provider_a})
+        smart = SmartRouterProvider(ctx)
+        first = smart._rank("SIMPLE", False, ctx.get_providers())
+        self.assertIs(smart._rank("SIMPLE", False, ctx.get_providers()), first)
+
+        ctx._providers["provider_b"] = DummyProvider(
+            "provider_b", {"mini": {"id": "mini", "cost": {"input": 0.05, "output": 0.1}}}
+        )
+        second = smart._rank("SIMPLE", False, ctx.get_providers())
+        self.assertIsNot(second, first)
+        self.assertEqual(second[0][0], "provider_b")
+
+        provider_a.map_models = {"flash": "flash"}
+        self.assertIsNot(smart._rank("SIMPLE", False, ctx.get_providers()), second)
+
+    def test_large_context_forces_complex_and_keeps_agentic_signal(self):
+        async def run_test():
+            provider_a = DummyProvider(
+                "provider_a",
+                {"pro": {"id": "pro", "cost": {"input": 5.0, "output": 10.0}}},
+            )
+            ctx = DummyCtx({"provider_a": provider_a})
+            smart = SmartRouterProvider(ctx, {"overrides": {"maxTokensForceComplex": 10}})
+            content = "Read the file, edit the config, deploy it and verify the result. " * 10
+            chat = {"model": "auto", "messages": [{"role": "user", "content": content}]}
+
+            response = await smart.chat(chat, context={})
+            self.assertEqual(response["routing"]["tier"], "COMPLEX")
+            self.assertTrue(response["routing"]["agentic"])
+            self.assertIn("large context", response["routing"]["reasoning"])
+            self.assertIn("auto-agentic", response["routing"]["reasoning"])
+
+        asyncio.run(run_test())
+
     def test_provider_selection_is_pinned_within_context(self):
         async def run_test():
             provider_a = DummyProvider(